@@ -1,23 +1,196 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, render_template, request, jsonify, stream_with_context
+from flask.json.provider import DefaultJSONProvider
+import orjson
+import pyarrow as pa
+import pyarrow.parquet as pq
 import pandas as pd
+import numpy as np
 import joblib
+import sklearn
 import os
+import functools
+import hashlib
+import math
+import bisect
+import json
+import time
+import threading
+import redis
 import requests
-import random
 from datetime import datetime, date, timedelta
 
+try:
+    import fcntl
+except ImportError:  # Windows: the dev server is a single process anyway
+    fcntl = None
+
 # ---------------- APP INIT ----------------
+class OrjsonProvider(DefaultJSONProvider):
+    """jsonify() backed by orjson; falls back to Flask's default for other types."""
+
+    option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=self.option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 # ---------------- LOAD MODELS ----------------
-base_model = joblib.load(os.path.join(BASE_DIR, "models", "base_model.pkl"))
-holiday_model = joblib.load(os.path.join(BASE_DIR, "models", "holiday_model.pkl"))
+# Both forests are only needed for the startup pricing pass below, so they
+# are loaded there and never kept resident.
+BASE_MODEL_PATH = os.path.join(BASE_DIR, "models", "base_model.pkl")
+HOLIDAY_MODEL_PATH = os.path.join(BASE_DIR, "models", "holiday_model.pkl")
 
 # ---------------- LOAD DATA ----------------
-df = pd.read_csv(os.path.join(BASE_DIR, "data", "Clean_flight_data.csv"))
-df["days_left"] = df["days_left"].astype(int)
-df["class"] = df["class"].str.capitalize()
+DATA_CSV = os.path.join(BASE_DIR, "data", "Clean_flight_data.csv")
+DATA_PARQUET = os.path.join(BASE_DIR, "data", "flights.parquet")
+CATEGORY_COLUMNS = [
+    "airline", "source_city", "destination_city",
+    "class", "departure_time", "arrival_time"
+]
+
+def prepare_flights(raw):
+    raw["days_left"] = raw["days_left"].astype(np.int8)
+    raw["stops"] = raw["stops"].astype(np.int8)
+    raw["source_city"] = raw["source_city"].str.strip()
+    raw["destination_city"] = raw["destination_city"].str.strip()
+    raw["class"] = raw["class"].str.strip().str.capitalize()
+    for col in CATEGORY_COLUMNS:
+        raw[col] = raw[col].astype("category")
+    return raw
+
+# Parquet schema metadata key holding the digest of the CSV it was built from
+PARQUET_SOURCE_KEY = b"source_csv_sha256"
+
+def csv_digest():
+    digest = hashlib.sha256()
+    with open(DATA_CSV, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest().encode()
+
+def parquet_is_current():
+    if not os.path.exists(DATA_PARQUET):
+        return False
+    if not os.path.exists(DATA_CSV):
+        # Deployed without the source CSV; the Parquet copy is all there is
+        return True
+    metadata = pq.read_schema(DATA_PARQUET).metadata or {}
+    return metadata.get(PARQUET_SOURCE_KEY) == csv_digest()
+
+def load_flights():
+    # The Parquet copy is already normalised; the CSV is the fallback source
+    if parquet_is_current():
+        return pd.read_parquet(DATA_PARQUET, memory_map=True)
+    if os.path.exists(DATA_PARQUET):
+        app.logger.warning(
+            "%s does not match %s; loading the CSV. Run `flask --app app build-parquet`.",
+            DATA_PARQUET, DATA_CSV,
+        )
+    return prepare_flights(pd.read_csv(DATA_CSV))
+
+@app.cli.command("build-parquet")
+def build_parquet():
+    """Rebuild data/flights.parquet from the flight CSV."""
+    table = pa.Table.from_pandas(prepare_flights(pd.read_csv(DATA_CSV)), preserve_index=False)
+    metadata = {**(table.schema.metadata or {}), PARQUET_SOURCE_KEY: csv_digest()}
+    pq.write_table(table.replace_schema_metadata(metadata), DATA_PARQUET)
+
+df = load_flights()
+
+# Index rows by normalised (source, destination, class, days_left) and sort,
+# so a search never has to scan the columns.
+df.index = pd.MultiIndex.from_arrays(
+    [
+        df["source_city"].str.lower(),
+        df["destination_city"].str.lower(),
+        df["class"].str.lower(),
+        df["days_left"],
+    ],
+    names=["source_key", "destination_key", "class_key", "days_left_key"],
+)
+df = df.sort_index()
+
+# Rows for each key are contiguous after the sort, so a request resolves to a
+# dict hit plus a positional slice.
+ROW_SLICES = {
+    key: slice(positions[0], positions[-1] + 1)
+    for key, positions in df.groupby(level=list(range(df.index.nlevels))).indices.items()
+}
+
+# ---------------- PRECOMPUTED PRICES ----------------
+FEATURES = [
+    "source_city", "destination_city", "airline",
+    "departure_time", "arrival_time", "stops",
+    "class", "days_left", "day_of_week", "is_holiday"
+]
+
+# Neither pipeline consumes day_of_week / is_holiday (the ColumnTransformer
+# drops them), so every row can be priced once here instead of per request.
+# The two columns are only filled in to satisfy the fitted feature names.
+_price_features = df.assign(day_of_week=0, is_holiday=0)[FEATURES]
+def same_fitted_encoding(a, b):
+    """True when two fitted preprocessors turn the same rows into the same matrix."""
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, str):
+        # "drop" / "passthrough" entries in a ColumnTransformer
+        return a == b
+    if hasattr(a, "steps"):
+        return len(a.steps) == len(b.steps) and all(
+            same_fitted_encoding(x, y) for (_, x), (_, y) in zip(a.steps, b.steps)
+        )
+    if hasattr(a, "transformers_"):
+        # Output feature names pin down the column routing of each transformer
+        named_a, named_b = a.named_transformers_, b.named_transformers_
+        return (
+            np.array_equal(a.get_feature_names_out(), b.get_feature_names_out())
+            and named_a.keys() == named_b.keys()
+            and all(same_fitted_encoding(named_a[n], named_b[n]) for n in named_a)
+        )
+    if a.get_params(deep=False) != b.get_params(deep=False):
+        return False
+    for attr in ("categories_", "drop_idx_", "mean_", "scale_", "var_"):
+        x, y = getattr(a, attr, None), getattr(b, attr, None)
+        if x is None and y is None:
+            continue
+        if x is None or y is None or len(x) != len(y):
+            return False
+        if not all(np.array_equal(i, j) for i, j in zip(x, y)):
+            return False
+    return True
+
+# The features come straight from the cleaned table, so sklearn's NaN/inf
+# validation pass is skipped. When both pipelines carry the same fitted
+# preprocessor the one-hot matrix is built once and fed to each regressor;
+# otherwise the holiday pipeline encodes the rows itself.
+with sklearn.config_context(assume_finite=True):
+    _base_model = joblib.load(BASE_MODEL_PATH)
+    _base_preprocessor = _base_model[:-1]
+    _encoded = _base_preprocessor.transform(_price_features)
+    _base_pred = _base_model[-1].predict(_encoded)
+    # Released before the second forest loads to keep the start-up peak down
+    del _base_model
+    _holiday_model = joblib.load(HOLIDAY_MODEL_PATH)
+    if same_fitted_encoding(_holiday_model[:-1], _base_preprocessor):
+        _holiday_pred = _holiday_model[-1].predict(_encoded)
+    else:
+        _holiday_pred = _holiday_model.predict(_price_features)
+    del _holiday_model, _base_preprocessor
+
+# holiday price = base + (holiday - base) * 0.75, fused in place
+np.subtract(_holiday_pred, _base_pred, out=_holiday_pred)
+np.multiply(_holiday_pred, 0.75, out=_holiday_pred)
+np.add(_holiday_pred, _base_pred, out=_holiday_pred)
+
+BASE_PRICES = np.round(_base_pred, 2, out=_base_pred).astype(np.float32)
+HOLIDAY_PRICES = np.round(_holiday_pred, 2, out=_holiday_pred).astype(np.float32)
+del _price_features, _encoded, _base_pred, _holiday_pred
 
 # ---------------- AIRPORT LOOKUP ----------------
 airport_lookup = {
@@ -53,6 +226,58 @@ def get_airline_logo(airline):
     return "/static/logos/indigo.png"
 
 
+# ---------------- DISPLAY LOOKUPS ----------------
+# Static per-airline / per-class / per-city values, mapped onto results with
+# Series.map instead of a Python lambda per row.
+AIRLINES = df["airline"].unique().tolist()
+PREMIUM_AIRLINES = {"Vistara", "Air India"}
+
+AIRLINE_LOGOS = {a: get_airline_logo(a) for a in AIRLINES}
+df["airline_logo"] = df["airline"].map(AIRLINE_LOGOS).astype("category")
+MEALS_BY_AIRLINE = {
+    a: "Complimentary Meals" if a in PREMIUM_AIRLINES else "Buy Onboard Meals" for a in AIRLINES
+}
+USB_BY_AIRLINE = {a: "Yes" if a in {"Vistara", "Air India", "IndiGo"} else "No" for a in AIRLINES}
+BEVERAGES_BY_AIRLINE = {
+    a: "Complimentary Beverages" if a in PREMIUM_AIRLINES else "Buy Onboard Beverages" for a in AIRLINES
+}
+BAGGAGE_BY_CLASS = {
+    c: "20kg Check-in + 7kg Cabin" if c == "Economy" else "30kg Check-in + 10kg Cabin"
+    for c in df["class"].unique()
+}
+AIRPORT_CODES = {city: info["code"] for city, info in airport_lookup.items()}
+AIRPORT_NAMES = {city: info["name"] for city, info in airport_lookup.items()}
+CODE_TO_CITY = {info["code"]: city for city, info in airport_lookup.items()}
+HOLIDAY_LABELS = {0: "Standard Pricing", 1: "Holiday Pricing"}
+AIRCRAFT_CHOICES = np.array(["A350", "B787"])
+
+# Premium carriers fly an A350 or B787 picked by a stable hash of the flight
+# number, so a flight shows the same aircraft on every search.
+_widebody = AIRCRAFT_CHOICES[pd.util.hash_array(df["flight"].to_numpy()) & 1]
+df["aircraft"] = pd.Categorical(
+    np.where(df["airline"].isin(PREMIUM_AIRLINES), _widebody, "A320")
+)
+del _widebody
+
+# Remaining display fields are static per city / airline / class, so they are
+# mapped once here as categoricals and simply carried through each slice.
+DISPLAY_COLUMNS = {
+    "source_code": ("source_city", AIRPORT_CODES),
+    "destination_code": ("destination_city", AIRPORT_CODES),
+    "source_airport": ("source_city", AIRPORT_NAMES),
+    "destination_airport": ("destination_city", AIRPORT_NAMES),
+    "meals": ("airline", MEALS_BY_AIRLINE),
+    "usb": ("airline", USB_BY_AIRLINE),
+    "beverages": ("airline", BEVERAGES_BY_AIRLINE),
+    "baggage": ("class", BAGGAGE_BY_CLASS),
+}
+for _column, (_key, _mapping) in DISPLAY_COLUMNS.items():
+    df[_column] = df[_key].map(_mapping).astype("category")
+df["depart_terminal"] = df["arrival_terminal"] = pd.Categorical.from_codes(
+    np.zeros(len(df), dtype=np.int8), categories=["T1"]
+)
+
+
 # ---------------- TIME SLOTS ----------------
 TIME_SLOT_LABELS = {
     "early_morning": "Early Morning (3AM - 6AM)",
@@ -63,19 +288,28 @@ TIME_SLOT_LABELS = {
     "late_night": "Late Night (12AM - 3AM)",
 }
 
+HOUR_TO_SLOT = (
+    ("late_night",) * 3 + ("early_morning",) * 3 + ("morning",) * 6 +
+    ("afternoon",) * 6 + ("evening",) * 2 + ("night",) * 4
+)
+
+VALID_SLOTS = frozenset(TIME_SLOT_LABELS)
+
+@functools.lru_cache(maxsize=2048)
 def get_time_slot(time_str):
-    if not time_str or ":" not in time_str:
+    if not time_str:
         return "unknown"
-    try:
-        hour = int(time_str.split(":")[0])
-        if 0 <= hour < 6: return "early_morning"
-        if 6 <= hour < 12: return "morning"
-        if 12 <= hour < 18: return "afternoon"
-        if 18 <= hour < 20: return "evening"
-        if 20 <= hour <= 23: return "night"
-    except:
-        pass
-    return "unknown"
+    hour, sep, _ = time_str.partition(":")
+    hour = hour.strip()
+    if sep and hour.isascii() and hour.isdigit():
+        return HOUR_TO_SLOT[int(hour)] if int(hour) < 24 else "unknown"
+    # The dataset stores time bands as labels such as "Early Morning"
+    slot = time_str.strip().lower().replace(" ", "_")
+    return slot if slot in VALID_SLOTS else "unknown"
+
+# Bucketed once at load; Series.map on a categorical only visits each category
+df["departure_slot"] = df["departure_time"].map(get_time_slot).astype("category")
+df["arrival_slot"] = df["arrival_time"].map(get_time_slot).astype("category")
 
 # ---------------- SAFE HELPERS ----------------
 def clean_param(value):
@@ -83,123 +317,283 @@ def clean_param(value):
         return None
     return value
 
+def parse_multi_param(args, name):
+    raw = args.getlist(name)
+    if len(raw) == 1:
+        # Older links send one comma-separated value instead of repeated params
+        raw = raw[0].split(",")
+    values = {v for v in raw if clean_param(v)}
+    return values or None
+
 def extract_city(value):
     if not value:
         return None
     if "(" in value:
         return value.split("(")[0].strip()
-    return value
+    return CODE_TO_CITY.get(value.strip().upper(), value)
+
+# ---------------- REDIS CACHE (SAFE) ----------------
+REDIS_URL = os.getenv("REDIS_URL")
+FLIGHTS_CACHE_TTL = 600
+HOLIDAYS_CACHE_TTL = 86400
+HOLIDAYS_MISS_TTL = 3600
+
+def get_cache():
+    if not REDIS_URL:
+        return None
+    try:
+        client = redis.Redis.from_url(REDIS_URL, socket_timeout=1, socket_connect_timeout=1)
+        client.ping()
+        return client
+    except redis.RedisError:
+        return None
+
+cache = get_cache()
+
+def cache_key(prefix, *parts):
+    return ":".join([prefix] + [str(p).strip().lower() for p in parts])
+
+def cache_get(key):
+    if cache is None:
+        return None
+    try:
+        cached = cache.get(key)
+    except redis.RedisError:
+        return None
+    return json.loads(cached) if cached else None
+
+def cache_set(key, value, ttl):
+    if cache is None:
+        return
+    payload = value if isinstance(value, str) else json.dumps(value, default=str)
+    try:
+        cache.setex(key, ttl, payload)
+    except redis.RedisError:
+        pass
 
 # ---------------- GOOGLE HOLIDAYS (SAFE) ----------------
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
+HOLIDAY_CALENDAR_URL = (
+    "https://www.googleapis.com/calendar/v3/calendars/"
+    "en.indian%23holiday%40group.v.calendar.google.com/events"
+)
+
+# One pooled, gzip-enabled connection reused by every calendar refresh
+http = requests.Session()
+http.mount("https://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=1))
+http.headers["Accept-Encoding"] = "gzip"
 
 def get_holidays_api():
     if not GOOGLE_API_KEY:
         return {}
+    cached = cache_get("holidays")
+    if cached is not None:
+        return cached
     try:
         now = datetime.utcnow().isoformat() + "Z"
         end = (datetime.utcnow() + timedelta(days=365)).isoformat() + "Z"
-        url = (
-            "https://www.googleapis.com/calendar/v3/calendars/"
-            "en.indian#holiday@group.v.calendar.google.com/events"
-            f"?timeMin={now}&timeMax={end}&singleEvents=true&orderBy=startTime&key={GOOGLE_API_KEY}"
+        r = http.get(
+            HOLIDAY_CALENDAR_URL,
+            params={
+                "timeMin": now,
+                "timeMax": end,
+                "singleEvents": "true",
+                "orderBy": "startTime",
+                "key": GOOGLE_API_KEY,
+            },
+            timeout=10,
         )
-        r = requests.get(url, timeout=10)
         if r.status_code != 200:
+            cache_set("holidays", {}, HOLIDAYS_MISS_TTL)
             return {}
-        events = r.json().get("items", [])
-        return {e["start"]["date"]: e["summary"] for e in events if "date" in e["start"]}
-    except:
+        events = orjson.loads(r.content).get("items", [])
+        result = {e["start"]["date"]: e["summary"] for e in events if "date" in e["start"]}
+        cache_set("holidays", result, HOLIDAYS_CACHE_TTL)
+        return result
+    except (requests.RequestException, ValueError, KeyError, AttributeError):
+        return {}
+
+HOLIDAYS_FILE = os.path.join(BASE_DIR, "cache", "holidays.json")
+
+def load_holidays():
+    # Last-known-good copy from disk; an empty map if there is none yet
+    try:
+        with open(HOLIDAYS_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
         return {}
 
-holidays = get_holidays_api()
+def holidays_expire_in():
+    # Seconds until the file on disk goes stale; 0 if it already has or is missing
+    try:
+        age = time.time() - os.path.getmtime(HOLIDAYS_FILE)
+    except OSError:
+        return 0
+    return max(HOLIDAYS_CACHE_TTL - age, 0)
+
+def holidays_are_fresh():
+    return holidays_expire_in() > 0
+
+def fetch_and_store_holidays():
+    global holidays
+    if holidays_are_fresh():
+        # Another worker already fetched it (possibly while this one waited
+        # on the lock), so only the in-memory copy needs updating
+        holidays = load_holidays()
+        return
+    result = get_holidays_api()
+    if not result:
+        return
+    try:
+        tmp_file = f"{HOLIDAYS_FILE}.{os.getpid()}.tmp"
+        with open(tmp_file, "w") as f:
+            json.dump(result, f)
+        os.replace(tmp_file, HOLIDAYS_FILE)
+    except OSError:
+        pass
+    holidays = result
+
+def refresh_holidays():
+    # Workers refresh concurrently after fork; the first to take the lock
+    # fetches and the rest load the file it wrote.
+    try:
+        os.makedirs(os.path.dirname(HOLIDAYS_FILE), exist_ok=True)
+        lock = open(f"{HOLIDAYS_FILE}.lock", "w")
+    except OSError:
+        fetch_and_store_holidays()
+        return
+    with lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        fetch_and_store_holidays()
+
+def holiday_refresh_loop():
+    # Lives as long as the process, so a worker running past the TTL picks up
+    # the next calendar (or the file another worker fetched) instead of
+    # keeping its start-up copy forever. A failed fetch is retried sooner.
+    while True:
+        refresh_holidays()
+        time.sleep(holidays_expire_in() or HOLIDAYS_MISS_TTL)
+
+def start_holiday_refresh():
+    # Refresh in the background so start-up never waits on the API
+    if GOOGLE_API_KEY:
+        threading.Thread(target=holiday_refresh_loop, daemon=True).start()
+
+holidays = load_holidays()
+
+# gunicorn.conf.py imports the app in the master and starts the refresh from
+# its post_fork hook instead, since a thread does not survive the fork.
+if os.environ.get("HOLIDAYS_REFRESH_AFTER_FORK") != "1":
+    start_holiday_refresh()
 
 # ---------------- JINJA FILTER ----------------
 @app.template_filter("format_date")
 def format_date(value):
     try:
         return datetime.strptime(value, "%Y-%m-%d").strftime("%d %B %Y")
-    except:
+    except (TypeError, ValueError):
         return value
 
-# ---------------- FEATURE ENGINEERING ----------------
-def enrich_features(df, travel_date):
-    df = df.copy()
-    d = datetime.strptime(travel_date, "%Y-%m-%d").date()
-    df["day_of_week"] = d.weekday()
-    df["is_holiday"] = 1 if travel_date in holidays else 0
-    return df
-
 # ---------------- CORE ML ENGINE ----------------
-def recommend_flights(source, destination, flight_class, travel_date, sort_by="cheap"):
+# Fields read by flight-details.html and the /flight-details filters; model-only
+# columns are left out of the per-row dicts.
+RESPONSE_COLUMNS = [
+    "airline", "flight", "airline_logo", "aircraft",
+    "source_city", "source_code", "source_airport", "depart_terminal",
+    "destination_city", "destination_code", "destination_airport", "arrival_terminal",
+    "departure_time", "arrival_time", "actual_dep_time", "actual_arr_time",
+    "duration", "stops", "predicted_price", "holiday",
+    "meals", "usb", "beverages", "baggage"
+]
+
+def to_records(frame, columns):
+    # One tolist() per column unboxes in C; zipping those lists into row dicts
+    # is ~2x cheaper than DataFrame.to_dict(orient="records").
+    return [dict(zip(columns, row)) for row in zip(*(frame[c].tolist() for c in columns))]
+
+def find_flights(source, destination, flight_class, travel_date, columns=None):
     if not all([source, destination, flight_class, travel_date]):
-        return []
+        return pd.DataFrame()
 
     today = date.today()
     travel_date_obj = datetime.strptime(travel_date, "%Y-%m-%d").date()
     days_left = (travel_date_obj - today).days
 
-    filtered = df[
-        (df["source_city"].str.lower() == source.lower()) &
-        (df["destination_city"].str.lower() == destination.lower()) &
-        (df["class"].str.lower() == flight_class.lower()) &
-        (df["days_left"] == days_left)
-    ].copy()
+    rows = ROW_SLICES.get((
+        source.strip().lower(),
+        destination.strip().lower(),
+        flight_class.strip().lower(),
+        days_left,
+    ))
+    if rows is None:
+        return pd.DataFrame()
+
+    # day_of_week / is_holiday are per-request scalars and prices are already
+    # precomputed, so they are resolved here instead of broadcast as columns.
+    is_holiday = int(travel_date in holidays)
+    prices = HOLIDAY_PRICES if is_holiday else BASE_PRICES
+    matched = df.iloc[rows] if columns is None else df.iloc[rows][columns]
+    return matched.assign(
+        predicted_price=prices[rows],
+        holiday=HOLIDAY_LABELS[is_holiday],
+    )
 
+def recommend_flights_df(source, destination, flight_class, travel_date, sort_by="cheap"):
+    filtered = find_flights(source, destination, flight_class, travel_date)
     if filtered.empty:
-        return []
-
-    filtered = enrich_features(filtered, travel_date)
-
-    features = [
-        "source_city", "destination_city", "airline",
-        "departure_time", "arrival_time", "stops",
-        "class", "days_left", "day_of_week", "is_holiday"
-    ]
+        return filtered
 
-    filtered["predicted_price"] = base_model.predict(filtered[features])
-
-    if filtered["is_holiday"].iloc[0] == 1:
-        holiday_pred = holiday_model.predict(filtered[features])
-        filtered["predicted_price"] += (holiday_pred - filtered["predicted_price"]) * 0.75
+    # ---------- SORT ----------
+    if sort_by == "best":
+        filtered = filtered.sort_values(by=["stops", "departure_time", "predicted_price"])
+    else:
+        filtered = filtered.sort_values(by=["predicted_price"])
 
-    # ---------- DISPLAY ENRICHMENT ----------
-    filtered["airline_logo"] = filtered["airline"].apply(get_airline_logo)
-    filtered["source_code"] = filtered["source_city"].map(lambda c: airport_lookup[c]["code"])
-    filtered["destination_code"] = filtered["destination_city"].map(lambda c: airport_lookup[c]["code"])
-    filtered["source_airport"] = filtered["source_city"].map(lambda c: airport_lookup[c]["name"])
-    filtered["destination_airport"] = filtered["destination_city"].map(lambda c: airport_lookup[c]["name"])
+    return filtered
 
-    filtered["aircraft"] = filtered["airline"].apply(
-        lambda a: random.choice(["A350", "B787"]) if a in ["Vistara", "Air India"] else "A320"
+# as_of and is_holiday only key the caches, as in build_filters. The process
+# cache is checked first and Redis only on a miss; a list is ~250 KiB, so the
+# per-worker cache stays small. Callers must treat the returned list and its
+# dicts as read-only.
+@functools.lru_cache(maxsize=64)
+def build_flights(source, destination, flight_class, travel_date, sort_by, as_of, is_holiday):
+    key = cache_key(
+        "rf", source, destination, flight_class, travel_date, sort_by, as_of, int(is_holiday)
     )
+    cached = cache_get(key)
+    if cached is not None:
+        return cached
 
-    filtered["depart_terminal"] = "T1"
-    filtered["arrival_terminal"] = "T1"
-
-    filtered["meals"] = filtered["airline"].apply(
-        lambda a: "Complimentary Meals" if a in ["Vistara", "Air India"] else "Buy Onboard Meals"
-    )
+    fdf = recommend_flights_df(source, destination, flight_class, travel_date, sort_by)
+    if fdf.empty:
+        return []
 
-    filtered["usb"] = filtered["airline"].apply(
-        lambda a: "Yes" if a in ["Vistara", "Air India", "IndiGo"] else "No"
-    )
+    fdf = fdf[RESPONSE_COLUMNS]
+    if cache is not None:
+        # pandas' C serializer writes the cached payload without building dicts
+        cache_set(key, fdf.to_json(orient="records"), FLIGHTS_CACHE_TTL)
+    return to_records(fdf, RESPONSE_COLUMNS)
 
-    filtered["beverages"] = filtered["airline"].apply(
-        lambda a: "Complimentary Beverages" if a in ["Vistara", "Air India"] else "Buy Onboard Beverages"
-    )
+def recommend_flights(source, destination, flight_class, travel_date, sort_by="cheap"):
+    if not all([source, destination, flight_class, travel_date]):
+        return []
 
-    filtered["baggage"] = filtered["class"].apply(
-        lambda c: "20kg Check-in + 7kg Cabin" if c == "Economy" else "30kg Check-in + 10kg Cabin"
+    return build_flights(
+        source, destination, flight_class, travel_date, sort_by,
+        date.today().isoformat(), travel_date in holidays
     )
 
-    # ---------- SORT ----------
-    if sort_by == "best":
-        filtered = filtered.sort_values(by=["stops", "departure_time", "predicted_price"])
-    else:
-        filtered = filtered.sort_values(by=["predicted_price"])
+# ---------------- STREAMED PAGES ----------------
+STREAM_BUFFER_ITEMS = 128
 
-    return filtered.to_dict(orient="records")
+def stream_page(template_name, **context):
+    # Send a large page while it renders; Jinja yields per statement, so group
+    # its output into bigger chunks instead of thousands of tiny writes.
+    app.update_template_context(context)
+    stream = app.jinja_env.get_template(template_name).stream(context)
+    stream.enable_buffering(size=STREAM_BUFFER_ITEMS)
+    return app.response_class(stream_with_context(stream))
 
 # ---------------- ROUTES ----------------
 @app.route("/")
@@ -227,78 +621,137 @@ def searchflight():
     return render_template("flight-details.html")
 
 # ---------------- AUTOCOMPLETE ----------------
+# Sorted by lowercase city so a prefix match is a bisect plus a short scan
+AIRPORT_SUGGESTIONS = sorted(
+    (
+        (city.lower(), {"label": f"{city} ({info['code']})", "value": f"{city} ({info['code']})"})
+        for city, info in airport_lookup.items()
+    ),
+    key=lambda item: item[0],
+)
+AIRPORT_SUGGESTION_KEYS = [key for key, _ in AIRPORT_SUGGESTIONS]
+
 @app.route("/suggest-airport")
 def suggest_airport():
     q = request.args.get("q", "").lower()
-    return jsonify([
-        {"label": f"{city} ({info['code']})", "value": f"{city} ({info['code']})"}
-        for city, info in airport_lookup.items()
-        if city.lower().startswith(q)
-    ])
+    matches = []
+    for key, suggestion in AIRPORT_SUGGESTIONS[bisect.bisect_left(AIRPORT_SUGGESTION_KEYS, q):]:
+        if not key.startswith(q):
+            break
+        matches.append(suggestion)
+    return jsonify(matches)
 
 # ---------------- FILTER API ----------------
-@app.route("/get-filters")
-def get_filters():
-    source = extract_city(clean_param(request.args.get("source")))
-    destination = extract_city(clean_param(request.args.get("destination")))
-    flight_class = clean_param(request.args.get("class"))
-    travel_date = clean_param(request.args.get("date"))
-
-    flights = recommend_flights(source, destination, flight_class, travel_date)
-
-    if not flights:
-        return jsonify({
-            "airlines": [],
-            "min_price": 0,
-            "max_price": 0,
-            "stops": [],
-            "departure_times": [],
-            "arrival_times": []
-        })
-
-    prices = [f["predicted_price"] for f in flights]
-
-    stop_prices = {}
-    for f in flights:
-        stop_prices.setdefault(f["stops"], []).append(f["predicted_price"])
+EMPTY_FILTERS = {
+    "airlines": [],
+    "min_price": 0,
+    "max_price": 0,
+    "stops": [],
+    "departure_times": [],
+    "arrival_times": []
+}
 
-    return jsonify({
-        "airlines": sorted(set(f["airline"] for f in flights)),
-        "min_price": int(min(prices)),
-        "max_price": int(max(prices)),
+# Must match step="100" on the price-range input in flight-details.html
+PRICE_SLIDER_STEP = 100
+
+# /get-filters only reads these, so the slice skips every display column
+FILTER_COLUMNS = ["airline", "stops", "departure_slot", "arrival_slot"]
+
+# as_of and is_holiday only key the caches (in-process and Redis): days_left
+# shifts at midnight and the holiday map can be refreshed in the background.
+@functools.lru_cache(maxsize=8192)
+def build_filters(source, destination, flight_class, travel_date, as_of, is_holiday):
+    key = cache_key("gf", source, destination, flight_class, travel_date, as_of, int(is_holiday))
+    cached = cache_get(key)
+    if cached is not None:
+        return cached
+
+    # Aggregates only need the priced slice, not display columns or ordering
+    fdf = find_flights(source, destination, flight_class, travel_date, FILTER_COLUMNS)
+
+    if fdf.empty:
+        return EMPTY_FILTERS
+
+    prices = fdf["predicted_price"]
+    stop_min = fdf.groupby("stops")["predicted_price"].min()
+    dep_slots = set(fdf["departure_slot"].unique())
+    arr_slots = set(fdf["arrival_slot"].unique())
+
+    # The range input snaps to min + k * step, so the maximum is rounded up
+    # onto that grid; otherwise an untouched slider reports a value below the
+    # dearest flight and filters it out.
+    min_price = int(prices.min())
+    max_price = min_price + math.ceil((prices.max() - min_price) / PRICE_SLIDER_STEP) * PRICE_SLIDER_STEP
+
+    result = {
+        "airlines": sorted(fdf["airline"].unique().tolist()),
+        "min_price": min_price,
+        "max_price": int(max_price),
         "stops": [
             {
                 "label": "Non Stop" if s == 0 else f"{s} Stop",
-                "value": s,
-                "min_price": int(min(p))
+                "value": int(s),
+                "min_price": int(p)
             }
-            for s, p in stop_prices.items()
+            for s, p in stop_min.items()
         ],
         "departure_times": [
             {"label": TIME_SLOT_LABELS[t], "value": t}
-            for t in sorted({get_time_slot(f["departure_time"]) for f in flights})
+            for t in sorted(dep_slots)
             if t != "unknown"
         ],
         "arrival_times": [
             {"label": TIME_SLOT_LABELS[t], "value": t}
-            for t in sorted({get_time_slot(f["arrival_time"]) for f in flights})
+            for t in sorted(arr_slots)
             if t != "unknown"
         ]
-    })
+    }
+    cache_set(key, result, FLIGHTS_CACHE_TTL)
+    return result
+
+@app.route("/get-filters")
+def get_filters():
+    source = extract_city(clean_param(request.args.get("source")))
+    destination = extract_city(clean_param(request.args.get("destination")))
+    flight_class = clean_param(request.args.get("class"))
+    travel_date = clean_param(request.args.get("date"))
+
+    return jsonify(build_filters(
+        source, destination, flight_class, travel_date,
+        date.today().isoformat(), travel_date in holidays
+    ))
 
 # ---------------- FLIGHT DETAILS ----------------
 @app.route("/flight-details")
 def flight_details():
-    source = extract_city(request.args.get("source"))
-    destination = extract_city(request.args.get("destination"))
-    flight_class = request.args.get("class")
-    travel_date = request.args.get("date")
-    sort_by = request.args.get("sort_by", "cheap")
-    travellers = int(request.args.get("travellers", 1))
+    args = request.args
+    source = extract_city(args.get("source"))
+    destination = extract_city(args.get("destination"))
+    flight_class = args.get("class")
+    travel_date = args.get("date")
+    sort_by = args.get("sort_by", "cheap")
+    travellers = int(args.get("travellers", 1))
+
+    allowed_airlines = parse_multi_param(args, "airline")
+    allowed_stops = parse_multi_param(args, "stops")
+    allowed_dep = parse_multi_param(args, "departure_time")
+    allowed_arr = parse_multi_param(args, "arrival_time")
+    max_p_str = clean_param(args.get("max_price"))
+    max_p = int(max_p_str) if max_p_str and max_p_str.isdigit() else None
 
     flights = recommend_flights(source, destination, flight_class, travel_date, sort_by)
 
-    return render_template(
+    # Single pass over the results for every sidebar filter
+    flights = [
+        f for f in flights
+        if (allowed_airlines is None or f["airline"] in allowed_airlines)
+        and (allowed_stops is None or str(f["stops"]) in allowed_stops)
+        and (allowed_dep is None or get_time_slot(f["departure_time"]) in allowed_dep)
+        and (allowed_arr is None or get_time_slot(f["arrival_time"]) in allowed_arr)
+        and (max_p is None or f["predicted_price"] <= max_p)
+    ]
+
+    return stream_page(
         "flight-details.html",
         flights=flights,
         source=source,
@@ -310,5 +763,7 @@ def flight_details():
     )
 
 # ---------------- MAIN ----------------
+# Dev server only; in production run `gunicorn app:app` (see gunicorn.conf.py)
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=int(os.environ.get("PORT", 8080)))
+    debug = os.environ.get("FLASK_DEBUG", "0") == "1"
+    app.run(host="0.0.0.0", port=int(os.environ.get("PORT", 8080)), debug=debug, threaded=True)
@@ -0,0 +1,25 @@
+import multiprocessing
+import os
+
+# ---------------- GUNICORN ----------------
+# Picked up automatically by `gunicorn app:app` from the project root.
+bind = f"0.0.0.0:{os.environ.get('PORT', 8080)}"
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+
+# Import the app (models, flight table, precomputed prices) once in the
+# master so workers share those pages copy-on-write instead of each loading
+# and pricing the table again.
+preload_app = True
+
+# The master only imports the app; each worker starts its own holiday refresh
+# after fork (refresh_holidays lets one of them fetch), so no thread or open
+# connection is ever carried across a fork.
+os.environ["HOLIDAYS_REFRESH_AFTER_FORK"] = "1"
+
+
+def post_fork(server, worker):
+    import app
+
+    app.start_holiday_refresh()
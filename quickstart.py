@@ -66,10 +66,6 @@ def get_holidays(days=364):
         print(f"An error occurred: {error}")
         return []
 
-# Fetch holidays for the next 30 days
-holidays = get_holidays(364)
-print("Upcoming Holidays:", holidays)
-
 def get_demand_factor(travel_date, holidays):
     """Adjust demand factor based on holidays near the travel date."""
     event_factor = 1.0  # Default factor
@@ -94,49 +90,6 @@ def get_demand_factor(travel_date, holidays):
 
     return event_factor
 
-# ✅ Fetch upcoming holidays
-holidays = get_holidays(300)  # Fetch for the next 300 days
-
-# Example Usage
-travel_date = "2025-08-15"  # Janmashtami
-demand_factor = get_demand_factor(travel_date, holidays)
-print(f"Demand Factor for {travel_date}: {demand_factor}")
-
-df = pd.read_csv("Clean_flight_data.csv")
-
-df["days_left"] = df["days_left"].astype(int)
-df["class"] = df["class"].str.capitalize()
-
-features = ["source_city", "destination_city", "class", "days_left"]
-target = "price"
-
-X = df[features]
-y = df[target]
-
-y = y.clip(upper=30000)
-
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-
-categorical_features = ["source_city", "destination_city", "class"]
-
-preprocessor = ColumnTransformer(
-    transformers=[
-        ("cat", OneHotEncoder(handle_unknown="ignore"), categorical_features)
-    ]
-)
-
-model = Pipeline([
-    ("preprocessor", preprocessor),
-    ("regressor", RandomForestRegressor(n_estimators=300, max_depth=15, min_samples_split=5, random_state=42, n_jobs=-1)) # Increased depth for better learning
-])
-
-model.fit(X_train, y_train)
-
-y_pred = model.predict(X_test)
-mae = mean_absolute_error(y_test, y_pred)
-
-print(f"Mean Absolute Error: {mae:.2f}")
-
 # Function to recommend cheapest flights
 def recommend_flights(source, destination, flight_class, days_left, df, model, top_n=10):
     """Recommend flights based on price and real-time event demand."""
@@ -164,9 +117,62 @@ def recommend_flights(source, destination, flight_class, days_left, df, model, t
 
     return sorted_flights[["airline", "flight", "departure_time", "stops", "arrival_time","days_left", "final_price"]]
 
-source_input = "Delhi"
-destination_input = "Mumbai"
-class_input = "Economy"
-days_left_input = 1
-recommended_flights = recommend_flights(source_input, destination_input, class_input, days_left_input, df,model)
-print(recommended_flights)
+
+def main():
+    # Fetch holidays for the next 30 days
+    holidays = get_holidays(364)
+    print("Upcoming Holidays:", holidays)
+
+    # ✅ Fetch upcoming holidays
+    holidays = get_holidays(300)  # Fetch for the next 300 days
+
+    # Example Usage
+    travel_date = "2025-08-15"  # Janmashtami
+    demand_factor = get_demand_factor(travel_date, holidays)
+    print(f"Demand Factor for {travel_date}: {demand_factor}")
+
+    df = pd.read_csv("Clean_flight_data.csv")
+
+    df["days_left"] = df["days_left"].astype(int)
+    df["class"] = df["class"].str.capitalize()
+
+    features = ["source_city", "destination_city", "class", "days_left"]
+    target = "price"
+
+    X = df[features]
+    y = df[target]
+
+    y = y.clip(upper=30000)
+
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+
+    categorical_features = ["source_city", "destination_city", "class"]
+
+    preprocessor = ColumnTransformer(
+        transformers=[
+            ("cat", OneHotEncoder(handle_unknown="ignore"), categorical_features)
+        ]
+    )
+
+    model = Pipeline([
+        ("preprocessor", preprocessor),
+        ("regressor", RandomForestRegressor(n_estimators=300, max_depth=15, min_samples_split=5, random_state=42, n_jobs=-1)) # Increased depth for better learning
+    ])
+
+    model.fit(X_train, y_train)
+
+    y_pred = model.predict(X_test)
+    mae = mean_absolute_error(y_test, y_pred)
+
+    print(f"Mean Absolute Error: {mae:.2f}")
+
+    source_input = "Delhi"
+    destination_input = "Mumbai"
+    class_input = "Economy"
+    days_left_input = 1
+    recommended_flights = recommend_flights(source_input, destination_input, class_input, days_left_input, df,model)
+    print(recommended_flights)
+
+
+if __name__ == "__main__":
+    main()